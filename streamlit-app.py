@@ -1,23 +1,13 @@
 #!/usr/bin/env python
 # coding: utf-8
-from utils import *
+from utils import (
+    load_teams, load_team_lookup, get_team_roster, load_player_game_log, extract_previous_game_stats,
+    validate_active_player, run_td_model, roster_td_probs, decimal_to_american_odds, get_current_nfl_week,
+    best_odds_model, best_odds_provider, create_player_odds_df, create_heatmap, get_past_performance,
+    reload_sportsbook_odds
+)
 import streamlit as st
-import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-import requests
-from datetime import datetime, timedelta
-from sklearn.model_selection import TimeSeriesSplit
-from sklearn.metrics import accuracy_score
-from sklearn.cluster import KMeans
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.ensemble._forest import ForestClassifier
-import altair as alt
-import joblib
-import pickle
-import plotly.express as px
-import pytz
 
 st.set_page_config(page_title="Big Game Fallacy?", initial_sidebar_state="expanded")
 
@@ -28,6 +18,7 @@ st.set_page_config(page_title="Big Game Fallacy?", initial_sidebar_state="expand
 # Title 
 st.title("Big Game Gabe Touchdown Model?")
 st.write("Pick an NFL pass catcher and see if they're due for a Gabe Davis style Big Game")
+# Get Year + Week once per rerun (cached in utils); every tab below reuses it
 year, week = get_current_nfl_week()
 st.write(f"Week {week}")
 # Tabs
@@ -65,24 +56,23 @@ with tab_player:
         st.error("Team data is unavailable. Please check back later.")
         st.stop()
 
-    # Validate Default Index = Jacksonville Jaguars
-    try:
-        default_team_index = dfTeams[dfTeams['FullName'] == 'Minnesota Vikings'].index[0]
-    except IndexError:
-        default_team_index = 0
-    default_team_index= int(default_team_index) # Fallback to the first option if default is not found
+    # Team Lookup (FullName -> id)
+    team_ids = load_team_lookup()
+    team_names = list(team_ids)
+
+    # Validate Default Index = Minnesota Vikings
+    default_team_index = team_names.index('Minnesota Vikings') if 'Minnesota Vikings' in team_names else 0 # Fallback to the first option if default is not found
 
     # Team Select Drop Down
-    selected_team = st.selectbox("Select an NFL team:", dfTeams['FullName'], index=default_team_index)
+    selected_team = st.selectbox("Select an NFL team:", team_names, index=default_team_index)
 
     # Validate Selected Team
-    selected_team_row = dfTeams[dfTeams['FullName'] == selected_team]
-    if selected_team_row.empty:
+    if selected_team not in team_ids:
         st.warning("Invalid team selected. Please try again.")
         st.stop()
 
     # Validate team_id
-    team_id = selected_team_row['id'].values[0]
+    team_id = team_ids[selected_team]
     if not team_id or not isinstance(team_id, (int, str, np.int64)):
         st.error("Invalid team ID. Unable to load roster for the selected team.")
         st.stop()
@@ -100,6 +90,8 @@ with tab_player:
 
     # Validate Selected Player
     selected_player_row = validate_active_player(dfRoster, selected_player)
+    # Pull the player's scalar fields once instead of re-indexing the row Series
+    player_name = selected_player_row['fullName']
     # Validate Player ID
     player_id = selected_player_row['playerId']
     if not player_id or not isinstance(player_id, (int, str, np.int64)):
@@ -115,53 +107,45 @@ with tab_player:
     st.image(player_image, width=300)
     st.divider()
 
-    # Load Full Roster
-    dfFullRoster = load_roster()
-    # Data Retrieval 1 - Player Data -----------------------------------------------------------------------------------
-    try:
-        gameLogData = load_data_for_roster(dfFullRoster)
-    except ValueError as e:
-        st.error(str(e))
-        st.stop()
-
-    playerData = gameLogData[gameLogData['fullName'] == selected_player_row['fullName']]
-
-    # Validate that data exists for the selected player
-    if playerData.empty:
-        st.warning(f"No game data found for player: {selected_player_row['fullName']}. Please check your input or data source.")
-        st.stop()
-
-    # Model Parameters 1 -----------------------------------------------------------------------------------------------
-    try:
-        stats = extract_previous_game_stats(playerData)
-        required_keys = [
-            'nextWeek', 'lag_yds', 'cumulative_yards_per_game', 
-            'cumulative_receptions_per_game', 'cumulative_targets_per_game', 
-            'avg_receiving_yards_last_3', 'avg_receptions_last_3', 
-            'avg_targets_last_3', 'yards_per_reception', 
-            'td_rate_per_target', 'is_first_week'
-        ]
-        missing_keys = [key for key in required_keys if key not in stats]
-        if missing_keys:
-            raise ValueError(f"Missing required stats keys: {missing_keys}")
-
-    except ValueError as e:
-        st.error(f"Error extracting game stats: {str(e)}")
-        st.stop()
-
-
     # Display Week + Year
-    # Get Week + Year
-    year, week = get_current_nfl_week()
     st.markdown(f'''
-    Click `Predict` to see:  {selected_player_row['fullName']} - NFL Week {week} anytime touchdown scorer odds.
+    Click `Predict` to see:  {player_name} - NFL Week {week} anytime touchdown scorer odds.
     ''')
     # Execute Model 1 ----------------------------------------------------------------------------------------------------
     if st.button("Predict "):
 
+        # Model Output 1 - Batched Team Scores ------------------------------------------------------------------------
+        # The team roster is scored in one cached batch, so Predict is normally a lookup by player id
+        td_likelihood = roster_td_probs(team_id).get(player_id)
+
+        if td_likelihood is None:
+            # Data Retrieval 1 - Player Data ---------------------------------------------------------------------------
+            # Only needed when the player is missing from the team batch
+            try:
+                playerData = load_player_game_log(player_name)
+            except ValueError as e:
+                st.error(str(e))
+                st.stop()
+            if playerData is None:
+                st.error("Game log data is unavailable. Please check back later.")
+                st.stop()
+
+            # Validate that data exists for the selected player
+            if playerData.empty:
+                st.warning(f"No game data found for player: {player_name}. Please check your input or data source.")
+                st.stop()
+
+            # Model Parameters 1 ---------------------------------------------------------------------------------------
+            try:
+                stats = extract_previous_game_stats(playerData)
+            except ValueError as e:
+                st.error(f"Error extracting game stats: {str(e)}")
+                st.stop()
+
         try:
-            # Run Model
-            td_likelihood = run_td_model(stats)
+            # Run Model (single prediction fallback; run_td_model checks the feature keys)
+            if td_likelihood is None:
+                td_likelihood = run_td_model(stats)
 
             # Validate Model Output
             if not isinstance(td_likelihood, (float, int)):
@@ -169,14 +153,14 @@ with tab_player:
 
             # Display Likelihood
             # st.markdown(f'''
-            #     The likelihood of {selected_player_row['fullName']} scoring a receiving touchdown is: 
+            #     The likelihood of {player_name} scoring a receiving touchdown is: 
             #     ##### {round(td_likelihood*100, 2)} %
             #     ''')
             # Using HTML to center content
 
             st.markdown(f"""
                 <div style="text-align: left;">
-                    <p>The likelihood of {selected_player_row['fullName']} scoring a receiving touchdown is: </p>
+                    <p>The likelihood of {player_name} scoring a receiving touchdown is: </p>
                 </div>
                 <div style="text-align: center;">
                     <h5>{round(td_likelihood*100, 2)} %</h5>
@@ -188,12 +172,12 @@ with tab_player:
 
             # Display Odds
             # st.markdown(f'''
-            #     The expected American Odds of {selected_player_row['fullName']} scoring a receiving touchdown is: 
+            #     The expected American Odds of {player_name} scoring a receiving touchdown is: 
             #     ##### {odds_str}
             #     ''')
             st.markdown(f"""
                 <div style="text-align: left;">
-                    <p>The expected American Odds of {selected_player_row['fullName']} scoring a receiving touchdown is: </p>
+                    <p>The expected American Odds of {player_name} scoring a receiving touchdown is: </p>
                 </div>
                 <div style="text-align: center;">
                     <h5>{odds_str}</h5>
@@ -201,7 +185,7 @@ with tab_player:
             """, unsafe_allow_html=True)
             
             # Get Individual Player Odds ---------------------------------------------------------------------------------
-            combineddf = create_player_odds_df(odds, selected_player_row['fullName'])
+            combineddf = create_player_odds_df(odds, player_name)
             
             # Create Heatmap
             create_heatmap(combineddf)
@@ -217,9 +201,6 @@ with tab_player:
 with tab_best_odds:
 
     # Model Best Odds -------------------------------------------------------------------
-    # Get Year + Week
-    year, week = get_current_nfl_week()
-
     # Title
     st.markdown(f'''
     ### NFL Week {week} - Model's Value Anytime TD Odds
@@ -230,7 +211,7 @@ with tab_best_odds:
     ''')
 
     # Get the model odds
-    modelOdds = best_odds_model()
+    modelOdds = best_odds_model(year, week)
 
     # Data Validation for modelOdds
     if modelOdds is not None and not modelOdds.empty:
@@ -252,7 +233,7 @@ with tab_best_odds:
 
     # Data Validation for provider odds
     if provider is not None and provider in provider_list:
-        providerOdds = best_odds_provider(provider)
+        providerOdds = best_odds_provider(provider, year, week)
 
         if providerOdds is not None and not providerOdds.empty:
             st.dataframe(providerOdds, use_container_width = True)
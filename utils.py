@@ -1,18 +1,15 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from requests_cache import CachedSession, DEFAULT_IGNORED_PARAMS, DO_NOT_CACHE, NEVER_EXPIRE
 from datetime import datetime, timedelta
-from sklearn.model_selection import TimeSeriesSplit
-from sklearn.metrics import accuracy_score
-from sklearn.cluster import KMeans
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.ensemble._forest import ForestClassifier
+from concurrent.futures import ThreadPoolExecutor
 import altair as alt
 import joblib
-import pickle
+import orjson
 import os
 import pytz
 
@@ -20,25 +17,82 @@ import pytz
 rapidapi_key = st.secrets["api"]["rapidapi_key"]
 odds_api_key = st.secrets["api"]['odds_api_key']
 
+# API HEADERS
+rapidapi_headers = {
+    "x-rapidapi-key": rapidapi_key,
+    "x-rapidapi-host": "nfl-api1.p.rapidapi.com"
+}
+
+# API SESSION (pooled keep-alive connections shared by every request in the module)
+# RapidAPI responses are cached on disk for an hour so restarts don't re-spend the quota;
+# odds API calls always go to the network so `Reload Odds` stays fresh
+_SESSION = CachedSession(
+    'data/api_cache',
+    backend='sqlite',
+    allowable_methods=['GET'],
+    stale_if_error=True,
+    urls_expire_after={'nfl-api1.p.rapidapi.com': 3600, '*': DO_NOT_CACHE},
+    # Keep the RapidAPI key out of cache keys and out of the requests stored on disk
+    ignored_parameters=[*DEFAULT_IGNORED_PARAMS, 'x-rapidapi-key']
+)
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=Retry(total=3, backoff_factor=0.3)))
+# Seconds to wait on any API call before giving up (connect + read)
+api_timeout = 10
+
+
+# WEEKLY DATA FILES ----------------------------------------------------------------------
+# Weekly odds and game-log files are written as Parquet; weeks saved before the switch are still read from their CSV
+def legacy_csv_path(file_path):
+    return os.path.splitext(file_path)[0] + '.csv'
+
+def weekly_file_exists(file_path):
+    return os.path.exists(file_path) or os.path.exists(legacy_csv_path(file_path))
+
+def read_weekly_file(file_path, columns=None):
+    if os.path.exists(file_path):
+        return pd.read_parquet(file_path, columns=columns)
+    return pd.read_csv(legacy_csv_path(file_path), usecols=columns)
+
+def write_weekly_file(df, file_path):
+    df.to_parquet(file_path, index=False, compression='zstd')
+
+def remove_weekly_file(file_path):
+    removed = False
+    for path in (file_path, legacy_csv_path(file_path)):
+        if os.path.exists(path):
+            os.remove(path)
+            removed = True
+    return removed
 
 # LOAD TEAMS -----------------------------------------------------------------------------
+@st.cache_data(ttl=86400)
 def load_teams():
-    dfTeams = pd.read_csv('data/teamList.csv')
-    dfTeams = dfTeams[['id', 'abbrev', 'location', 'name']]
-    dfTeams['FullName'] = dfTeams['location'] + ' ' + dfTeams['name']
+    # Text columns load as arrow-backed strings so the FullName concatenation runs in arrow's kernel
+    text_dtype = 'string[pyarrow]'
+    dfTeams = pd.read_csv('data/teamList.csv', usecols=['id', 'abbrev', 'location', 'name'],
+                          dtype={'abbrev': text_dtype, 'location': text_dtype, 'name': text_dtype})
+    dfTeams = dfTeams.assign(FullName=dfTeams['location'].str.cat(dfTeams['name'], sep=' '))
     return dfTeams
 
+# LOAD TEAM LOOKUP -----------------------------------------------------------------------
+@st.cache_data(ttl=86400)
+def load_team_lookup():
+    # Map team FullName -> team id so selections resolve without scanning dfTeams
+    dfTeams = load_teams()
+    return dict(zip(dfTeams['FullName'], dfTeams['id']))
+
 # LOAD ROSTER ----------------------------------------------------------------------------
+@st.cache_data(ttl=3600)
 def load_roster():
     # Get Year + Week
     year, week = get_current_nfl_week()
     
     # File Path
-    file_path = f'data/rosters/{year}_week{week}_roster.csv'
+    file_path = f'data/rosters/{year}_week{week}_roster.parquet'
 
     # Check if File Path exists
-    if os.path.exists(file_path):
-        roster = pd.read_csv(file_path)
+    if weekly_file_exists(file_path):
+        roster = read_weekly_file(file_path)
         return roster
     
     # Load Teams
@@ -47,29 +101,14 @@ def load_roster():
     # Initialize an empty list to collect data
     all_rosters = []
     
-    # Roster URL for API
-    rosterurl = "https://nfl-api1.p.rapidapi.com/nflteamplayers"
-
-    # API Headers
-    headers = {
-        "x-rapidapi-key": rapidapi_key,
-        "x-rapidapi-host": "nfl-api1.p.rapidapi.com"
-    }
+    # Fetch every team's roster concurrently, then process the responses in team order
+    team_ids = teams['id'].tolist()
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        roster_responses = list(executor.map(fetch_team_roster, team_ids))
 
     # Iterate over each team's ID
-    for team in teams['id']:
-        querystring = {"teamid": team}
-
-        try:
-            # API GET Request
-            response = requests.get(rosterurl, headers=headers, params=querystring)
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            roster_json = response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Failed to fetch roster data for team ID {team}: {e}")
-            continue
-        except ValueError as e:
-            print(f"Invalid JSON response for team ID {team}: {e}")
+    for team, roster_json in zip(team_ids, roster_responses):
+        if roster_json is None:
             continue
 
         # Extract athletes and team data
@@ -118,6 +157,10 @@ def load_roster():
         except Exception as e:
             raise RuntimeError(f"Error converting 'activestatus' to int64: {e}")
 
+    # Numeric ids, matching the int team ids in teamList.csv (Parquet keeps whatever type the API sent)
+    for id_col in ['team_id', 'playerId']:
+        full_roster[id_col] = pd.to_numeric(full_roster[id_col], errors='coerce').astype('Int64')
+
     # Filter for relevant positions (WR and TE)
     if full_roster.empty:
         raise RuntimeError("No valid roster data available after processing.")
@@ -126,12 +169,31 @@ def load_roster():
     if full_roster_WR_TE.empty:
         raise RuntimeError("No WR or TE players found in the rosters.")
     
-    # Save the combined roster to a CSV file
-    full_roster_WR_TE.to_csv(file_path, index=False)
+    # Save the combined roster for the week
+    write_weekly_file(full_roster_WR_TE, file_path)
 
     return full_roster_WR_TE
 
+# FETCH TEAM ROSTER ----------------------------------------------------------------------
+def fetch_team_roster(team):
+    # Roster URL for API
+    rosterurl = "https://nfl-api1.p.rapidapi.com/nflteamplayers"
+    querystring = {"teamid": team}
+
+    try:
+        # API GET Request
+        response = _SESSION.get(rosterurl, headers=rapidapi_headers, params=querystring, timeout=api_timeout)
+        response.raise_for_status()  # Raise an exception for HTTP errors
+        return orjson.loads(response.content)
+    except requests.exceptions.RequestException as e:
+        print(f"Failed to fetch roster data for team ID {team}: {e}")
+        return None
+    except ValueError as e:
+        print(f"Invalid JSON response for team ID {team}: {e}")
+        return None
+
 # GET ROSTER -----------------------------------------------------------------------------
+@st.cache_data(ttl=3600, show_spinner=False)
 def get_team_roster(teamid):
     if not teamid:
         raise ValueError("Invalid team ID provided.")
@@ -150,21 +212,43 @@ def get_team_roster(teamid):
     if team_roster.empty:
         raise ValueError(f"No players found for team ID '{teamid}'.")
 
-    return team_roster
+    # Index by fullName so player lookups are a hashed .loc instead of a column scan
+    # (index left unnamed so groupby/merge/sort on the fullName column stay unambiguous)
+    return team_roster.set_index('fullName', drop=False).rename_axis(None)
 
 # VALIDATE PLAYER STATUS -----------------------------------------------------------------
 def validate_active_player(dfRoster, selected_player):
-    selected_player_row = dfRoster[dfRoster['fullName'] == selected_player]
-
-    if selected_player_row.empty:
+    if selected_player not in dfRoster.index:
         st.stop()
-    if not selected_player_row['activestatus'].values[0] == 1:
+    # First row for the player, materialized once as a Series
+    selected_player_row = dfRoster.loc[[selected_player]].iloc[0]
+
+    if not selected_player_row['activestatus'] == 1:
         st.warning(f"{selected_player} is not active. Please select a different player.")
         st.stop()
 
-    return selected_player_row.iloc[0]  # Return the row for the active player
+    return selected_player_row  # Return the row for the active player
+
+# FETCH PLAYER GAME LOG -----------------------------------------------------------------
+def fetch_player_game_log(player_id, season, completed=False):
+    log_url = "https://nfl-api1.p.rapidapi.com/player-game-log"
+    querystring = {"playerId": player_id, "season": str(season)}
+    # Logs for finished seasons never change, so their cached responses are kept indefinitely
+    expire_after = NEVER_EXPIRE if completed else None
+
+    try:
+        response = _SESSION.get(log_url, headers=rapidapi_headers, params=querystring, timeout=api_timeout, expire_after=expire_after)
+        response.raise_for_status()
+        return orjson.loads(response.content)
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching data for playerId {player_id} in season {season}: {e}")
+        return None
+    except ValueError as e:
+        print(f"Invalid JSON response for playerId {player_id} in season {season}: {e}")
+        return None
 
 # LOAD DATA
+@st.cache_data(ttl=3600)
 def load_data_for_roster(roster_df):
     if not isinstance(roster_df, pd.DataFrame):
         raise ValueError("Invalid roster_df. Expected a pandas DataFrame.")
@@ -172,140 +256,192 @@ def load_data_for_roster(roster_df):
     year, week = get_current_nfl_week()
 
     # Define the final results file path
-    file_path = f"data/playerData/{year}_week{week}/roster_game_logs.csv"
+    file_path = f"data/playerData/{year}_week{week}/roster_game_logs.parquet"
     os.makedirs(os.path.dirname(file_path), exist_ok=True)
 
-    # Check if the combined CSV already exists
-    if os.path.exists(file_path):
+    # Check if the combined game logs already exist
+    if weekly_file_exists(file_path):
         st.write(f"Loading existing data for NFL {year} - Week {week}...")
-        return pd.read_csv(file_path)
+        return read_weekly_file(file_path)
 
     all_game_logs = []
+    player_experiences = []
 
-    log_url = "https://nfl-api1.p.rapidapi.com/player-game-log"
-    headers = {
-        "x-rapidapi-key": rapidapi_key,
-        "x-rapidapi-host": "nfl-api1.p.rapidapi.com"
-    }
+    # Calculate adjusted experience for the whole roster at once: seasons played + current, capped at the lookback
+    lookback = 3
+    if 'exp' in roster_df.columns:
+        experience = pd.to_numeric(roster_df['exp'], errors='coerce').fillna(0).astype(int) + 1
+    else:
+        experience = pd.Series(1, index=roster_df.index)
+    adjusted_experience = experience.clip(lower=1, upper=lookback)
+    current_year = datetime.now().year
+    # Regular seasons wrap up in early January, so last year's season is final from March on
+    last_completed_season = current_year - 1 if datetime.now().month >= 3 else current_year - 2
 
-    for _, player_row in roster_df.iterrows():
+    for player_row, adjusted_exp in zip(roster_df.itertuples(index=False), adjusted_experience):
         # Validate player_row
-        if 'playerId' not in player_row or pd.isna(player_row['playerId']):
+        player_id = getattr(player_row, 'playerId', None)
+        if player_id is None or pd.isna(player_id):
             continue
 
-        if 'exp' not in player_row or not isinstance(player_row['exp'], (int, float, np.int64, np.float64)) or pd.isna(player_row['exp']):
-            exp = 1
-        else:
-            exp = int(player_row['exp']) + 1
-
-        # Calculate adjusted experience and years
-        lookback = 3
-        adjusted_exp = min(exp, lookback)
-        current_year = datetime.now().year
+        # Seasons to pull for this player
         years = [current_year - i for i in range(adjusted_exp)]
 
         # Create player experience DataFrame
-        player_experience_df = pd.DataFrame({
-            'playerId': [player_row['playerId']] * adjusted_exp,
-            'fullName': [player_row['fullName']] * adjusted_exp,
+        player_experiences.append(pd.DataFrame({
+            'playerId': [player_id] * adjusted_exp,
+            'fullName': [player_row.fullName] * adjusted_exp,
             'Year': years
-        })
-
-        rows, labels = [], []
-
-        for _, row in player_experience_df.iterrows():
-            querystring = {"playerId": row["playerId"], "season": str(row["Year"])}
-            try:
-                response = requests.get(log_url, headers=headers, params=querystring)
-                response.raise_for_status()
-                json_data = response.json()
-
-                if "player_game_log" not in json_data or not json_data:
-                    continue
-
-                player_game_log = json_data["player_game_log"]
-                if not player_game_log:
-                    continue
-
-                labels = player_game_log.get("names", [])
-
-                for season in player_game_log.get("seasonTypes", []):
-                    season_name = season.get("displayName", "Unknown")
-                    for category in season.get("categories", []):
-                        for event in category.get("events", []):
-                            event_stats = event.get("stats", [])
-                            event_id = event.get("eventId", "Unknown")
-                            game_data = player_game_log.get("events", {}).get(event_id, {})
-
-                            row_data = event_stats + [
-                                game_data.get("week", "Unknown"),
-                                game_data.get("gameDate", "Unknown"),
-                                game_data.get("homeTeamScore", "Unknown"),
-                                game_data.get("awayTeamScore", "Unknown"),
-                                game_data.get("gameResult", "Unknown"),
-                                event_id,
-                                season_name
-                            ]
-                            row_data += row.drop(["playerId", "Year"]).tolist()
-                            rows.append(row_data)
-
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching data for playerId {row['playerId']} in season {row['Year']}: {e}")
+        }))
+
+    # Fetch every (player, season) game log concurrently, then parse sequentially below
+    season_requests = [
+        (row.playerId, row.Year)
+        for player_experience_df in player_experiences
+        for row in player_experience_df.itertuples(index=False)
+    ]
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        season_logs = dict(zip(season_requests, executor.map(lambda args: fetch_player_game_log(*args, completed=args[1] <= last_completed_season), season_requests)))
+
+    for player_experience_df in player_experiences:
+        # Game log is flattened per season with json_normalize and concatenated once per player
+        season_frames = []
+        # Positions of the columns carried onto every game row (everything but playerId/Year)
+        extra_cols = [i for i, col in enumerate(player_experience_df.columns) if col not in ("playerId", "Year")]
+        extra_col_names = [player_experience_df.columns[i] for i in extra_cols]
+
+        for row in player_experience_df.itertuples(index=False):
+            json_data = season_logs.get((row.playerId, row.Year))
+
+            if not json_data or "player_game_log" not in json_data:
+                continue
+
+            player_game_log = json_data["player_game_log"]
+            if not player_game_log:
                 continue
 
-        if rows:
+            labels = player_game_log.get("names", [])
+
+            # Fill in missing keys with the old loop's defaults first, so an odd season/category/event is skipped rather than raising
+            season_types = [
+                {
+                    "displayName": season.get("displayName", "Unknown"),
+                    "categories": [
+                        {"events": [{"eventId": event.get("eventId", "Unknown"), "stats": event.get("stats", [])}
+                                    for event in category.get("events", [])]}
+                        for category in season.get("categories", [])
+                    ],
+                }
+                for season in player_game_log.get("seasonTypes", [])
+            ]
+
+            # One row per event across every season type / category
+            events_df = pd.json_normalize(season_types, record_path=["categories", "events"], meta=["displayName"])
+            if events_df.empty:
+                continue
+
+            # Expand the per-event stats list into one column per label
+            stats_df = pd.DataFrame(events_df["stats"].tolist()).iloc[:, :len(labels)]
+            stats_df.columns = labels[:stats_df.shape[1]]
+
+            # Attach game details by eventId
+            game_info = ["week", "gameDate", "homeTeamScore", "awayTeamScore", "gameResult"]
+            games_df = pd.DataFrame.from_dict(player_game_log.get("events", {}), orient="index")
+            games_df = games_df.reindex(index=events_df["eventId"], columns=game_info).fillna("Unknown")
+            games_df.columns = ["week", "date", "homeScore", "awayScore", "result"]
+
+            season_df = pd.concat([stats_df, games_df.reset_index(drop=True)], axis=1)
+            season_df["eventId"] = events_df["eventId"]
+            season_df["seasonName"] = events_df["displayName"]
+            for i, col in zip(extra_cols, extra_col_names):
+                season_df[col] = row[i]
+            season_frames.append(season_df)
+
+        if season_frames:
             # Process game log data for the player
-            column_headers = labels + [
-                "week", "date", "homeScore", "awayScore", "result",
-                "eventId", "seasonName"
-            ] + [col for col in player_experience_df.columns if col not in ["playerId", "Year"]]
-
-            game_log = pd.DataFrame(rows, columns=column_headers)
-            game_log["seasonYr"] = game_log["seasonName"].str.slice(0, 4).str.strip()
-            game_log["seasonType"] = game_log["seasonName"].str.slice(4).str.strip()
+            game_log = pd.concat(season_frames, ignore_index=True)
+            game_log[["seasonYr", "seasonType"]] = game_log["seasonName"].str.extract(r"^\s*(\d{4})\s*(.*?)\s*$")
             game_log = game_log[game_log["seasonType"] == "Regular Season"]
 
             numeric_columns = ["receivingTouchdowns", "receptions", "receivingYards", "receivingTargets", "fumbles"]
-            for col in numeric_columns:
-                game_log[col] = pd.to_numeric(game_log[col], errors="coerce").fillna(0).astype(int)
-
-            game_log.sort_values(by=["seasonYr", "seasonType", "week"], inplace=True)
-
-            # Add lagged features
-            game_log = game_log.sort_values(by=["fullName", "seasonYr", "week"]).reset_index(drop=True)
-            game_log["weeks_played"] = game_log.groupby(["seasonYr", "fullName"]).cumcount() + 1
-
-            def calculate_lagged_features(group):
-                group["cumulative_receiving_yards"] = group["receivingYards"].cumsum().shift(1)
-                group["cumulative_receptions"] = group["receptions"].cumsum().shift(1)
-                group["cumulative_receiving_touchdowns"] = group["receivingTouchdowns"].cumsum().shift(1)
-                group["cumulative_targets"] = group["receivingTargets"].cumsum().shift(1)
-                group["cumulative_yards_per_game"] = group["cumulative_receiving_yards"] / (group["weeks_played"] - 1)
-                group["cumulative_receptions_per_game"] = group["cumulative_receptions"] / (group["weeks_played"] - 1)
-                group["cumulative_tds_per_game"] = group["cumulative_receiving_touchdowns"] / (group["weeks_played"] - 1)
-                group["cumulative_targets_per_game"] = group["cumulative_targets"] / (group["weeks_played"] - 1)
-                group["avg_receiving_yards_last_3"] = group["receivingYards"].rolling(window=3, min_periods=1).mean().shift(1)
-                group["avg_receptions_last_3"] = group["receptions"].rolling(window=3, min_periods=1).mean().shift(1)
-                group["avg_tds_last_3"] = group["receivingTouchdowns"].rolling(window=3, min_periods=1).mean().shift(1)
-                group["avg_targets_last_3"] = group["receivingTargets"].rolling(window=3, min_periods=1).mean().shift(1)
-                group["yards_per_reception"] = (group["receivingYards"] / group["receptions"]).shift(1).replace([float("inf"), -float("inf")], 0)
-                group["td_rate_per_target"] = (group["cumulative_receiving_touchdowns"] / group["cumulative_targets"]).shift(1).replace([float("inf"), -float("inf")], 0)
-                return group
-
-            game_log = game_log.groupby(["seasonYr", "fullName"]).apply(calculate_lagged_features)
+            game_log[numeric_columns] = game_log[numeric_columns].apply(pd.to_numeric, errors="coerce").fillna(0).astype(np.int32)
+
+            # Integer weeks sort numerically on a fast integer path (missing weeks sort first as 0)
+            game_log["week"] = pd.to_numeric(game_log["week"], errors="coerce").fillna(0).astype(np.int16)
+
+            # Add lagged features (single stable sort; seasonType is constant after the Regular Season filter)
+            game_log = game_log.sort_values(by=["fullName", "seasonYr", "week"], kind="mergesort").reset_index(drop=True)
+
+            # Factorize (seasonYr, fullName) once so both groupbys hash int codes instead of string tuples
+            group_ids, _ = pd.factorize(game_log["seasonYr"] + "|" + game_log["fullName"])
+            game_log["weeks_played"] = game_log.groupby(group_ids, sort=False).cumcount() + 1
+
+            # Lagged features are built from whole-column groupby passes rather than a per-group apply
+            season_groups = game_log.groupby(group_ids, sort=False)
+            counting_stats = ["receivingYards", "receptions", "receivingTouchdowns", "receivingTargets"]
+            games_before = game_log["weeks_played"] - 1
+
+            # Running totals through the previous game (cumsum minus the current game is the shifted cumsum)
+            prior_totals = season_groups[counting_stats].cumsum() - game_log[counting_stats]
+            game_log["cumulative_receiving_yards"] = prior_totals["receivingYards"]
+            game_log["cumulative_receptions"] = prior_totals["receptions"]
+            game_log["cumulative_receiving_touchdowns"] = prior_totals["receivingTouchdowns"]
+            game_log["cumulative_targets"] = prior_totals["receivingTargets"]
+            game_log["cumulative_yards_per_game"] = game_log["cumulative_receiving_yards"] / games_before
+            game_log["cumulative_receptions_per_game"] = game_log["cumulative_receptions"] / games_before
+            game_log["cumulative_tds_per_game"] = game_log["cumulative_receiving_touchdowns"] / games_before
+            game_log["cumulative_targets_per_game"] = game_log["cumulative_targets"] / games_before
+
+            # Mean of up to three previous games in the season
+            last_3_totals = sum(season_groups[counting_stats].shift(lag, fill_value=0) for lag in (1, 2, 3))
+            last_3_avgs = last_3_totals.div(games_before.clip(upper=3), axis=0)
+            game_log["avg_receiving_yards_last_3"] = last_3_avgs["receivingYards"]
+            game_log["avg_receptions_last_3"] = last_3_avgs["receptions"]
+            game_log["avg_tds_last_3"] = last_3_avgs["receivingTouchdowns"]
+            game_log["avg_targets_last_3"] = last_3_avgs["receivingTargets"]
+
+            yards_per_reception = game_log["receivingYards"] / game_log["receptions"]
+            game_log["yards_per_reception"] = yards_per_reception.groupby(group_ids, sort=False).shift(1, fill_value=0).replace([float("inf"), -float("inf")], 0)
+            td_rate = game_log["cumulative_receiving_touchdowns"] / game_log["cumulative_targets"]
+            game_log["td_rate_per_target"] = td_rate.groupby(group_ids, sort=False).shift(1, fill_value=0).replace([float("inf"), -float("inf")], 0)
+
             game_log.fillna(0, inplace=True)
             game_log["is_first_week"] = (game_log["weeks_played"] == 1).astype(int)
             game_log['td'] = (game_log['receivingTouchdowns'] > 0).astype(int)
+            # Integer season so fresh and reloaded logs both compare against int years
+            game_log["seasonYr"] = game_log["seasonYr"].astype(int)
 
             all_game_logs.append(game_log)
 
     # Combine all player game logs and save the final results
-    final_game_logs = pd.concat(all_game_logs, ignore_index=True) if all_game_logs else pd.DataFrame()
-    final_game_logs.to_csv(file_path, index=False)
+    if not all_game_logs:
+        # Nothing was scraped; return early rather than caching an empty file
+        print(f"No game logs found for week {week}, year {year}")
+        return None
+    final_game_logs = pd.concat(all_game_logs, ignore_index=True)
+
+    # Parquet needs one type per column (fillna(0) mixes ints into text stat columns): type the
+    # leftover object columns the way a CSV round-trip did, numbers where they all parse, strings otherwise
+    for col in final_game_logs.select_dtypes(include="object").columns:
+        try:
+            final_game_logs[col] = pd.to_numeric(final_game_logs[col])
+        except (ValueError, TypeError):
+            final_game_logs[col] = final_game_logs[col].where(final_game_logs[col].isna(), final_game_logs[col].astype(str))
+    write_weekly_file(final_game_logs, file_path)
     st.write(f"New data cached for week {week}, year {year}")
 
     return final_game_logs
 
+# LOAD PLAYER GAME LOG -------------------------------------------------------------------
+@st.cache_data(ttl=3600, show_spinner=False)
+def load_player_game_log(player_name):
+    # Keyed by the player's name so reruns hash a string rather than the full roster DataFrame
+    gameLogData = load_data_for_roster(load_roster())
+    if gameLogData is None:
+        return None
+
+    return gameLogData[gameLogData['fullName'] == player_name]
+
 # EXTRACT PREVIOUS GAME ------------------------------------------------------------------
 def extract_previous_game_stats(gameData):
     # Validate input
@@ -326,8 +462,8 @@ def extract_previous_game_stats(gameData):
     if gameData.shape[0] < 1:
         raise ValueError("Insufficient data in gameData to extract previous game statistics.")
 
-    # Extract previous game stats (last row of DataFrame)
-    df_previous_game = gameData.iloc[-1]
+    # Extract previous game stats (last row of DataFrame) as a plain dict
+    df_previous_game = gameData.iloc[-1].to_dict()
     
     # Validate individual fields
     def validate_field(field, expected_type, default_value=None):
@@ -369,45 +505,78 @@ def extract_previous_game_stats(gameData):
 
     return stats
 
+# LOAD MODEL -----------------------------------------------------------------------------
+@st.cache_resource
+def load_td_model():
+    # Deserialize the RandomForest once per process and share it across sessions
+    # (no mmap_mode: sklearn's Tree.__setstate__ copies node arrays into its own buffers anyway)
+    model = joblib.load('models/wr-model.pkl')
+    # Predict in-thread; the app scores at most a league's worth of rows at once
+    model.n_jobs = 1
+    return model
+
 # RUN MODEL ------------------------------------------------------------------------------
-def run_td_model(stats_dict):
+# Model features, in the order the model was trained on
+td_model_features = [
+    'nextWeek', 'lag_yds', 'cumulative_yards_per_game', 
+    'cumulative_receptions_per_game', 'cumulative_targets_per_game', 
+    'avg_receiving_yards_last_3', 'avg_receptions_last_3', 
+    'avg_targets_last_3', 'yards_per_reception', 
+    'td_rate_per_target', 'is_first_week'
+]
+
+def run_td_model_batch(stats_dicts):
     # Load the model
-    model = joblib.load('models/wr-model.pkl')
+    model = load_td_model()
 
-    # Define the required fields
-    required_keys = [
-        'nextWeek', 'lag_yds', 'cumulative_yards_per_game', 
-        'cumulative_receptions_per_game', 'cumulative_targets_per_game', 
-        'avg_receiving_yards_last_3', 'avg_receptions_last_3', 
-        'avg_targets_last_3', 'yards_per_reception', 
-        'td_rate_per_target', 'is_first_week'
-    ]
-    
-    # Validate that all required keys are in the dictionary
-    missing_keys = [key for key in required_keys if key not in stats_dict]
-    if missing_keys:
-        raise ValueError(f"Missing required keys in stats dictionary: {missing_keys}")
-
-    # Prepare the features as an array for prediction
-    parameters = np.array([[
-        float(stats_dict['nextWeek']),
-        float(stats_dict['lag_yds']),
-        float(stats_dict['cumulative_yards_per_game']),
-        float(stats_dict['cumulative_receptions_per_game']),
-        float(stats_dict['cumulative_targets_per_game']),
-        float(stats_dict['avg_receiving_yards_last_3']),
-        float(stats_dict['avg_receptions_last_3']),
-        float(stats_dict['avg_targets_last_3']),
-        float(stats_dict['yards_per_reception']),
-        float(stats_dict['td_rate_per_target']),
-        int(stats_dict['is_first_week'])
-    ]])
+    # Validate that all required keys are in every dictionary
+    for stats_dict in stats_dicts:
+        missing_keys = [key for key in td_model_features if key not in stats_dict]
+        if missing_keys:
+            raise ValueError(f"Missing required keys in stats dictionary: {missing_keys}")
+
+    # Prepare the features as one (n_players, n_features) array so the forest is walked once;
+    # float32 is the dtype the trees split on, so sklearn uses it without another copy
+    parameters = np.empty((len(stats_dicts), len(td_model_features)), dtype=np.float32)
+    for i, key in enumerate(td_model_features):
+        parameters[:, i] = [stats_dict[key] for stats_dict in stats_dicts]
 
     # Perform prediction
-    likelihood = model.predict_proba(parameters)[:, 1]
-    return likelihood[0]
+    return model.predict_proba(parameters)[:, 1]
+
+def run_td_model(stats_dict):
+    # Single player prediction
+    return run_td_model_batch([stats_dict])[0]
+
+# RUN MODEL FOR A TEAM -------------------------------------------------------------------
+@st.cache_data(ttl=600, show_spinner=False)
+def roster_td_probs(teamid):
+    # Score the whole team roster in one batched call; the Predict button then becomes a lookup
+    team_roster = get_team_roster(teamid)
+    gameLogData = load_data_for_roster(load_roster())
+    if gameLogData is None:
+        return {}
+    team_gameLogData = gameLogData[gameLogData['fullName'].isin(team_roster['fullName'])]
+
+    player_names = []
+    player_stats = []
+    for player_name, player_data in team_gameLogData.groupby('fullName', sort=False):
+        try:
+            player_stats.append(extract_previous_game_stats(player_data))
+            player_names.append(player_name)
+        except ValueError as e:
+            print(f"Error processing player {player_name}: {e}")
+            continue
+
+    if not player_stats:
+        return {}
+
+    # Player id -> TD likelihood (game logs carry only fullName, so ids come from the team roster)
+    player_ids = dict(zip(team_roster['fullName'], team_roster['playerId']))
+    return {player_ids[name]: prob for name, prob in zip(player_names, run_td_model_batch(player_stats))}
 
 # GET NFL Season Start -------------------------------------------------------------------
+@st.cache_data(ttl=3600, show_spinner=False)
 def get_current_nfl_week():
     # 1. Instantiate Today
     eastern = pytz.timezone('US/Eastern')
@@ -447,26 +616,50 @@ def decimal_to_american_odds(probability):
 
     if probability is None:
         probability = 0
-    probability = round(probability * 100)
-    if probability < 0 or probability > 100:
+    percent = round(probability * 100)
+    if percent < 0 or percent > 100:
         raise ValueError("Probability must be between 0 and 100.")
     
-    if probability == 0:
+    if percent == 0:
         return float('inf')  # Infinite odds for 0% probability (no chance of winning)
-    elif probability == 100:
+    elif percent == 100:
         return -1  # This means a guaranteed win, represented as negative infinity odds
 
-    if probability < 50:  # Positive odds
-        odds = (100 / (probability / 100)) - 100
-        direction = '+'
-        favor = 1
-    else:  # Negative odds
-        odds = (probability / (1 - (probability / 100))) * -1
-        direction = ''
-        favor = -1
+    odds, favor = american_odds(probability)
+    odds, favor = float(odds), int(favor)
     
-    return f"{direction}{round(odds)}", odds, favor
+    return str(format_american_odds(odds, favor)), odds, favor
+
+# CONVERT TO AMERICAN ODDS (VECTORIZED) --------------------------------------------------
+def american_odds(probabilities):
+    # Works on a scalar or an array of probabilities; rounds to whole percents like decimal_to_american_odds
+    percent = np.round(np.asarray(probabilities, dtype=float) * 100)
+    underdog = percent < 50
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        odds = np.where(underdog, (100 / (percent / 100)) - 100, (percent / (1 - (percent / 100))) * -1)
+    favor = np.where(underdog, 1, -1)
+
+    return odds, favor
+
+# FORMAT AMERICAN ODDS (VECTORIZED) ------------------------------------------------------
+def format_american_odds(odds, favor=None):
+    # Whole-number odds as strings, '+' prefixed for underdogs (favor == 1, or positive odds if favor is not given)
+    odds = np.round(np.asarray(odds, dtype=float)).astype(np.int64)
+    if favor is None:
+        favor = np.where(odds > 0, 1, -1)
+    odds_str = odds.astype(str)
+
+    return np.where(np.asarray(favor) == 1, np.char.add('+', odds_str), odds_str)
     
+# FETCH EVENT ODDS -----------------------------------------------------------------------
+def fetch_event_odds(sport, region, event_id):
+    odds_url = f'https://api.the-odds-api.com/v4/sports/{sport}/events/{event_id}/odds'
+    response = _SESSION.get(odds_url, params={'apiKey': odds_api_key, 'regions': region, 'markets': 'player_anytime_td', 'oddsFormat': 'american'}, timeout=api_timeout)
+    response.raise_for_status()
+
+    return response.json()
+
 # GET SPORTSBOOK ODDS --------------------------------------------------------------------
 def get_sportsbook_odds():
     
@@ -482,7 +675,7 @@ def get_sportsbook_odds():
     
     try:
         # Fetch event data
-        response = requests.get(url, params=params)
+        response = _SESSION.get(url, params=params, timeout=api_timeout)
         response.raise_for_status()  # Raise an error for non-200 status codes
         events = response.json()
 
@@ -495,14 +688,11 @@ def get_sportsbook_odds():
 
         all_odds_data = {}
 
-        # Fetch odds for each event
-        for event_id in event_ids:
-            odds_url = f'https://api.the-odds-api.com/v4/sports/{sport}/events/{event_id}/odds'
-            response = requests.get(odds_url, params={'apiKey': odds_api_key, 'regions': region, 'markets': 'player_anytime_td', 'oddsFormat': 'american'})
-            response.raise_for_status()
-
-            json_data = response.json()
+        # Fetch odds for every event concurrently, then parse them in event order
+        with ThreadPoolExecutor(max_workers=6) as executor:
+            event_odds = list(executor.map(lambda event_id: fetch_event_odds(sport, region, event_id), event_ids))
 
+        for json_data in event_odds:
             # Extract odds for players
             for bookmaker in json_data.get('bookmakers', []):
                 book_title = bookmaker['title']
@@ -518,14 +708,10 @@ def get_sportsbook_odds():
                             all_odds_data[player_name][book_title] = odds
 
         # Convert the collected data into a DataFrame
-        odds_df = pd.DataFrame.from_dict(all_odds_data, orient='index').fillna('N/A')
-
-        # Ensure numeric columns are properly formatted
-        odds_df = odds_df.apply(pd.to_numeric, errors='coerce').round().fillna('N/A')
+        odds_df = pd.DataFrame.from_dict(all_odds_data, orient='index')
 
-        # Convert numeric values back to integers
-        for col in odds_df.columns:
-            odds_df[col] = odds_df[col].apply(lambda x: int(x) if isinstance(x, float) and not pd.isna(x) else x)
+        # Ensure numeric columns are properly formatted (books without a line stay NaN so the columns stay numeric)
+        odds_df = odds_df.apply(pd.to_numeric, errors='coerce').round()
         
         # Reset Index
         odds_df = odds_df.reset_index()
@@ -545,30 +731,30 @@ def get_sportsbook_odds():
 
 # FETCH SPORTSBOOK ODDS ------------------------------------------------------------------
 def load_or_fetch_odds(reload_odds=False):
-    # Define the path to your CSV file
+    # Define the path to the odds file
     year, week = get_current_nfl_week()
-    csv_file = f'data/sportsbookOdds/odds_{year}_week{week}.csv'
+    odds_file = f'data/sportsbookOdds/odds_{year}_week{week}.parquet'
 
     # If reload_odds is True, always fetch data, even if CSV exists
     if reload_odds:
         st.write("Reloading odds from source...")
         odds_df = get_sportsbook_odds()  # Call your function to fetch data
         if odds_df is not None:
-            # Save the DataFrame to a CSV file
-            odds_df.to_csv(csv_file, index=False)
+            # Save the DataFrame to the odds file
+            write_weekly_file(odds_df, odds_file)
             print("Data fetched and saved.")
         else:
             print("Error fetching data.")
             return None
     else:
         # Check if the CSV file exists
-        if not os.path.exists(csv_file):
+        if not weekly_file_exists(odds_file):
             # CSV doesn't exist, fetch and process the data
             #st.write("CSV file not found. Fetching data...")
             odds_df = get_sportsbook_odds()  # Call your function to fetch data
             if odds_df is not None:
-                # Save the DataFrame to a CSV file
-                odds_df.to_csv(csv_file, index=False)
+                # Save the DataFrame to the odds file
+                write_weekly_file(odds_df, odds_file)
                 print("Data fetched and saved.")
             else:
                 print("Error fetching data.")
@@ -576,7 +762,7 @@ def load_or_fetch_odds(reload_odds=False):
         else:
             # CSV exists, load the data
             #st.write("CSV file found. Loading data...")
-            odds_df = pd.read_csv(csv_file)
+            odds_df = read_weekly_file(odds_file)
 
     return odds_df
 
@@ -606,36 +792,24 @@ def create_heatmap(playerOddsDF):
     # Calculate the difference between provider odds and model odds
     df_melted['Difference'] = df_melted['Odds'] - df_melted['Model']
 
-    # Pivot the DataFrame for the heatmap
-    heatmap_data = df_melted.pivot(index="Player", columns="Provider", values="Odds")
-    difference_data = df_melted.pivot(index="Player", columns="Provider", values="Difference")
-    
     # Annotate with positive values marked as '+'
-    annot_data = heatmap_data.applymap(lambda x: f"+{round(x)}" if pd.notna(x) and x > 0 else (str(round(x)) if pd.notna(x) else ""))
+    odds_values = df_melted['Odds'].to_numpy(dtype=float)
+    df_melted['Label'] = np.where(np.isnan(odds_values), "", format_american_odds(np.nan_to_num(odds_values)))
 
-    # Set the colormap to a diverging palette (green for negative, red for positive)
-    cmap = sns.diverging_palette(10, 150, s=100, l=50, as_cmap=True)
-    
-    # Create the heatmap plot
-    plt.figure(figsize=(9, 5))
-    ax = sns.heatmap(
-        difference_data,
-        annot=annot_data,
-        fmt="",
-        cmap=cmap, 
-        center=0, 
-        cbar=False,
-        linewidths=.5
+    # Diverging colors centered on the model's odds (red where the book pays less, green where it pays more)
+    base = alt.Chart(df_melted).encode(
+        x=alt.X('Provider:N', title=None, axis=alt.Axis(orient='bottom', labelAngle=0)),
+        y=alt.Y('Player:N', title=None)
     )
+    cells = base.mark_rect(stroke='white', strokeWidth=0.5).encode(
+        color=alt.Color('Difference:Q', scale=alt.Scale(scheme='redyellowgreen', domainMid=0), legend=None),
+        tooltip=['Provider', 'Label', 'Difference']
+    )
+    labels = base.mark_text(color='black').encode(text='Label:N')
 
-    # Update titles and labels
-    plt.title('Odds Comparison Heatmap')
-    ax.set_xlabel("")
-    ax.set_ylabel("")
-
-    # Show the plot in Streamlit
-    st.pyplot(plt)
-    plt.clf()  # Clear the current figure after displaying
+    # Show the chart in Streamlit (drawn client-side from a small Vega-Lite spec)
+    chart = (cells + labels).properties(title='Odds Comparison Heatmap', height=120)
+    st.altair_chart(chart, use_container_width=True)
      
 # RUN MODEL FOR ALL PLAYERS --------------------------------------------------------------
 def get_total_model_odds():
@@ -643,51 +817,60 @@ def get_total_model_odds():
     # Get Year + Week
     year, week = get_current_nfl_week()
     # Get File if already exists
-    file_path = f'data/modelOdds/{year}_NFL_Week{week}_BestOdds.csv'
+    file_path = f'data/modelOdds/{year}_NFL_Week{week}_BestOdds.parquet'
 
     # Check if File Path exists
-    if os.path.exists(file_path):
-        odds_df = pd.read_csv(file_path)
+    if weekly_file_exists(file_path):
+        odds_df = read_weekly_file(file_path)
         return odds_df
     # Get Roster
     fullRoster = load_roster()
     actives = fullRoster[fullRoster['activestatus'] == 1]
     # Load Game Log Data 
     gameLogData = load_data_for_roster(fullRoster)
+    if gameLogData is None:
+        print("Error: Game log data could not be loaded.")
+        return pd.DataFrame()
     # Filter gameLogData to include only active players
     active_gameLogData = gameLogData[gameLogData['fullName'].isin(actives['fullName'])]
 
-    results = []
-    for player_name in active_gameLogData['fullName'].unique():
+    player_names = []
+    player_stats = []
+    for player_name, player_data in active_gameLogData.groupby('fullName', sort=False):
         try:
-            # Filter player-specific game log data
-            player_data = active_gameLogData[active_gameLogData['fullName'] == player_name]
-
             # Step 2: Ensure player data is available
             if player_data.empty:
                 continue  # Skip if no game log data available
 
             # Step 3: Extract previous game statistics
             stats = extract_previous_game_stats(player_data)
-
-            # Step 4: Run the touchdown model
-            td_likelihood = run_td_model(stats)
-            odds_str, odds, favor = decimal_to_american_odds(td_likelihood)
-
-            # Step 5: Store the result
-            results.append({
-                "Player": player_name,
-                "TD_Likelihood": td_likelihood,
-                "Model_Odds": odds,
-                "Favor": favor
-            })
+            player_names.append(player_name)
+            player_stats.append(stats)
 
         except Exception as e:
             print(f"Error processing player {player_name}: {e}")
             continue  # Skip any player that causes an error
-    # Convert results to a DataFrame
-    odds_df = pd.DataFrame(results)
-    odds_df.to_csv(file_path, index=False)
+
+    # Step 4: Run the touchdown model once for every player
+    td_likelihoods = run_td_model_batch(player_stats) if player_stats else np.array([])
+
+    # Step 5: Convert the whole column to American odds at once
+    model_odds, favor = american_odds(td_likelihoods)
+    odds_df = pd.DataFrame({
+        "Player": player_names,
+        "TD_Likelihood": td_likelihoods,
+        "Model_Odds": model_odds,
+        "Favor": favor
+    })
+
+    # Players rounding to 0% or 100% have no finite American odds; skip them
+    percent = np.round(td_likelihoods * 100)
+    priced = (percent > 0) & (percent < 100)
+    for player_name in odds_df.loc[~priced, "Player"]:
+        print(f"Skipping player {player_name}: no finite odds for likelihood")
+    odds_df = odds_df[priced].reset_index(drop=True)
+
+    write_weekly_file(odds_df, file_path)
 
     return odds_df
 
@@ -696,10 +879,10 @@ def get_all_odds():
     # Get Week + Year
     year, week = get_current_nfl_week()
 
-    file_path = f"data/combinedOdds/{year}_week{week}_combined_odds.csv"
+    file_path = f"data/combinedOdds/{year}_week{week}_combined_odds.parquet"
     # Check if File Path exists
-    if os.path.exists(file_path):
-        totalOdds = pd.read_csv(file_path)
+    if weekly_file_exists(file_path):
+        totalOdds = read_weekly_file(file_path)
 
         return totalOdds
     
@@ -735,22 +918,22 @@ def get_all_odds():
     totalOdds = totalOdds.loc[totalOdds['TD_Likelihood'].notna() & (totalOdds['TD_Likelihood'] != '')]
 
 
-    totalOdds.to_csv(file_path)
+    write_weekly_file(totalOdds, file_path)
 
     return totalOdds
 
 # MODEL BEST ODDS ------------------------------------------------------------------------
-def best_odds_model():
+@st.cache_data(ttl=900, show_spinner=False)
+def best_odds_model(year, week):
+    # year + week are part of the cache key so each NFL week gets its own entry
     odds = get_all_odds()
 
-    # get year + week
-    year, week = get_current_nfl_week()
-
-    file_path = f"data/historicalOdds/model/{year}_week{week}_valuepicks.csv"
-    if os.path.exists(file_path):
-        odds = pd.read_csv(file_path)
+    file_path = f"data/historicalOdds/model/{year}_week{week}_valuepicks.parquet"
+    if weekly_file_exists(file_path):
+        # Only load the columns used for display
+        odds = read_weekly_file(file_path, columns=['Player', 'Model_Odds', 'Favor'])
         odds['Odds'] = round(odds['Model_Odds'])
-        odds['Odds'] = odds.apply(lambda row: f"+{round(row['Odds'])}" if row['Favor'] == 1 else round(row['Odds']), axis=1)
+        odds['Odds'] = format_american_odds(odds['Odds'], odds['Favor'])
         odds = odds[['Player', 'Odds']].head(30)
         odds = odds.reset_index(drop=True)
         odds.index = odds.index+1
@@ -772,14 +955,14 @@ def best_odds_model():
     # Sort data by TD_Likelihood in descending order
     odds = odds.sort_values(by='TD_Likelihood', ascending=False)
 
-    # to CSV
-    odds.to_csv(file_path)
+    # Save the value picks
+    write_weekly_file(odds, file_path)
 
     # Round Odds
     odds['Odds'] = round(odds['Model_Odds'])
 
     # Add Prefix (Only if Favor is 1, otherwise keep as is)
-    odds['Odds'] = odds.apply(lambda row: f"+{round(row['Odds'])}" if row['Favor'] == 1 else round(row['Odds']), axis=1)
+    odds['Odds'] = format_american_odds(odds['Odds'], odds['Favor'])
 
     # Segment data fields
     odds = odds[['Player', 'Odds']].head(30)
@@ -789,23 +972,22 @@ def best_odds_model():
     return odds 
 
 # PROVIDER BEST ODDS ---------------------------------------------------------------------
-def best_odds_provider(provider):
-    # Check if 'provider' column exists in the DataFrame
+@st.cache_data(ttl=900, show_spinner=False)
+def best_odds_provider(provider, year, week):
+    # year + week are part of the cache key so each NFL week gets its own entry
     combinedOdds = get_all_odds()
 
-    # get year + week 
-    year, week = get_current_nfl_week()
-
      # Check if File Path Already Exists
-    file_path = f"data/historicalOdds/{provider}/{year}_week{week}_valuepicks.csv"
+    file_path = f"data/historicalOdds/{provider}/{year}_week{week}_valuepicks.parquet"
 
-    if os.path.exists(file_path):
-        odds = pd.read_csv(file_path)
+    if weekly_file_exists(file_path):
+        # Only load the columns used for display
+        odds = read_weekly_file(file_path, columns=['Player', 'Model_Odds', 'Favor', provider])
         # DATA PROCESSING 
 
         # Formatting
-        odds['Odds'] = odds.apply(lambda row: f"+{round(row['Model_Odds'])}" if row['Favor'] == 1 else round(row['Model_Odds']), axis=1)
-        odds[provider] = odds[provider].apply(lambda x: f"+{int(x)}" if x > 0 else str(int(x)))
+        odds['Odds'] = format_american_odds(odds['Model_Odds'], odds['Favor'])
+        odds[provider] = format_american_odds(odds[provider])
 
         # Subsetting
         odds = odds[['Player', 'Odds', provider]].head(30)
@@ -846,15 +1028,15 @@ def best_odds_provider(provider):
     # Sort by the difference in ascending order
     odds = odds.sort_values(by='WeightedValue', ascending=True)
 
-    # # Put to CSV
-    odds.to_csv(file_path)
+    # Save the value picks
+    write_weekly_file(odds, file_path)
 
     # Round Model_Odds and add prefix if Favor == 1
-    odds['Odds'] = odds.apply(lambda row: f"+{round(row['Model_Odds'])}" if row['Favor'] == 1 else round(row['Model_Odds']), axis=1)
+    odds['Odds'] = format_american_odds(odds['Model_Odds'], odds['Favor'])
 
 
     # Format provider odds with a "+" prefix if positive, else leave as is
-    odds[provider] = odds[provider].apply(lambda x: f"+{int(x)}" if x > 0 else str(int(x)))
+    odds[provider] = format_american_odds(odds[provider])
 
     # Select top 20 rows
     odds = odds[['Player', 'Odds', provider]].head(30)
@@ -878,17 +1060,21 @@ def get_past_performance(provider, unit, is_model=True):
 
     # Define the file path for last week's data
     if is_model:
-        file_path_lastweek = f"data/historicalOdds/model/{year}_week{last_week}_valuepicks.csv"
+        file_path_lastweek = f"data/historicalOdds/model/{year}_week{last_week}_valuepicks.parquet"
     else:
-        file_path_lastweek = f"data/historicalOdds/{provider}/{year}_week{last_week}_valuepicks.csv"
+        file_path_lastweek = f"data/historicalOdds/{provider}/{year}_week{last_week}_valuepicks.parquet"
 
     # Check if the file exists
-    if not os.path.exists(file_path_lastweek):
+    if not weekly_file_exists(file_path_lastweek):
         st.write(f"The historical stats for {provider} do not exist. Unable to retrieve past performance.")
         return None, None, pd.DataFrame()
 
-    # Read the historical odds data
-    lastWeekOdds = pd.read_csv(file_path_lastweek)
+    # Read only the columns the performance table uses
+    if is_model:
+        columns = ['Player', 'TD_Likelihood', 'Model_Odds', 'Favor', 'DraftKings', 'FanDuel']
+    else:
+        columns = ['Player', 'Model_Odds', 'Favor', provider, 'WeightedValue']
+    lastWeekOdds = read_weekly_file(file_path_lastweek, columns=columns)
     lastWeekOdds['Touchdowns'] = None
 
     # Load the roster
@@ -897,7 +1083,7 @@ def get_past_performance(provider, unit, is_model=True):
         raise ValueError("Roster is empty. Please check the data source.")
     # Load game log data for the roster
     gameLogData = load_data_for_roster(roster)
-    if gameLogData.empty:
+    if gameLogData is None:
         raise ValueError("Game log data is empty. Please ensure the data source is valid and populated.")
 
 
@@ -937,8 +1123,8 @@ def get_past_performance(provider, unit, is_model=True):
     lastWeekOdds['Win'] = lastWeekOdds.apply(lambda row: calculate_win(row, unit, provider), axis=1)
 
     # Format odds
-    lastWeekOdds['Odds'] = lastWeekOdds.apply(lambda row: f"+{round(row['Model_Odds'])}" if row['Favor'] == 1 else round(row['Model_Odds']), axis=1)
-    lastWeekOdds['Sportsbook'] = lastWeekOdds['Sportsbook'].apply(lambda x: f"+{int(x)}" if x > 0 else str(int(x)))
+    lastWeekOdds['Odds'] = format_american_odds(lastWeekOdds['Model_Odds'], lastWeekOdds['Favor'])
+    lastWeekOdds['Sportsbook'] = format_american_odds(lastWeekOdds['Sportsbook'])
 
     # Select top 30 rows
     lastWeekOdds = lastWeekOdds[['Player', 'Odds', 'Sportsbook', 'Touchdowns', 'Win']].head(30)
@@ -977,27 +1163,28 @@ def highlight_rows(row):
 def reload_sportsbook_odds():
     # Get Year + Week
     year, week = get_current_nfl_week()
-    # Delete CSVs
+    # Delete odds files
 
     # 1. sportsbook odds
-    sportsbook_path = f"data/sportsbookOdds/odds_{year}_week{week}.csv"
-    if os.path.exists(sportsbook_path):
-        os.remove(sportsbook_path)
+    sportsbook_path = f"data/sportsbookOdds/odds_{year}_week{week}.parquet"
+    if remove_weekly_file(sportsbook_path):
         st.write(f"File {sportsbook_path} has been deleted.")
     
     # 2. combined odds
-    combined_path = f"data/combinedOdds/odds_{year}_week{week}_combined_odds.csv"
-    if os.path.exists(combined_path):
-        os.remove(combined_path)
+    combined_path = f"data/combinedOdds/{year}_week{week}_combined_odds.parquet"
+    if remove_weekly_file(combined_path):
         st.write(f"File {combined_path} has been deleted.")
 
     # 3. delete best value picks
     providers = ['DraftKings', 'FanDuel', 'BetOnline.ag', 'BetRivers', 'BetMGM']
     for provider in providers:
-        file_path = f"data/historicalOdds/{provider}/{year}_week{week}_valuepicks.csv"
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        file_path = f"data/historicalOdds/{provider}/{year}_week{week}_valuepicks.parquet"
+        if remove_weekly_file(file_path):
             st.write(f"{provider} - Week {week} odds deleted!")
+
+    # Drop the memoized best-odds tables so the next render rebuilds them from the new odds
+    best_odds_model.clear()
+    best_odds_provider.clear()
     
     # 3. retrigger load odds
 